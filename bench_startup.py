@@ -0,0 +1,100 @@
+"""Startup benchmark for veilingmeester.py
+
+Measures, each in a fresh interpreter:
+  - import time of the bot module
+  - time-to-ready: import + the async startup phase (logging, database)
+    + the first poller query of persisted state, i.e. everything before the
+    Discord gateway connects
+
+It also checks that the lazily loaded dependencies are not imported at
+startup. Runs against a throwaway config/database in a temp directory, so no
+network or tokens are needed.
+
+Usage:
+    python bench_startup.py [--runs 10] [--max-import-ms 1500] [--max-ready-ms 2000]
+
+Exits non-zero when a threshold is exceeded or a lazy module leaks into startup.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+REPO_DIR = os.path.dirname(os.path.abspath(__file__))
+LAZY_MODULES = ["openai", "PIL", "humanize", "bs4"]
+
+PROBE = r"""
+import asyncio, json, sys, time
+t0 = time.perf_counter()
+import veilingmeester as vm
+t_import = time.perf_counter() - t0
+
+async def ready():
+    await vm.startup()
+    with vm.get_db_cursor() as c:
+        c.execute("SELECT auction_id, lot_id, user_id, last_bid FROM tracked_auctions")
+        c.fetchall()
+
+asyncio.run(ready())
+t_ready = time.perf_counter() - t0
+print(json.dumps({
+    "import": t_import,
+    "ready": t_ready,
+    "loaded": [m for m in LAZY if m in sys.modules],
+}))
+"""
+
+def write_config(workdir: str):
+    with open(os.path.join(workdir, "config.json"), "w") as f:
+        json.dump({
+            "discord_token": "bench",
+            "openai_api_key": "bench",
+            "log_channel_id": 1,
+            "allowed_channel_id": 1,
+            "updates_channel_id": 1,
+            "allowed_role_id": 1,
+        }, f)
+
+def run_once(workdir: str) -> dict:
+    env = dict(os.environ, PYTHONPATH=REPO_DIR + os.pathsep + os.environ.get("PYTHONPATH", ""))
+    code = f"LAZY = {LAZY_MODULES!r}\n" + PROBE
+    result = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=workdir, env=env, capture_output=True, text=True, check=True
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--max-import-ms", type=float, default=None)
+    parser.add_argument("--max-ready-ms", type=float, default=None)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as workdir:
+        write_config(workdir)
+        run_once(workdir)  # warm the filesystem and bytecode caches
+        samples = [run_once(workdir) for _ in range(args.runs)]
+
+    import_ms = [s["import"] * 1000 for s in samples]
+    ready_ms = [s["ready"] * 1000 for s in samples]
+    leaked = sorted({m for s in samples for m in s["loaded"]})
+
+    print(f"import:        median {statistics.median(import_ms):7.1f} ms  min {min(import_ms):7.1f} ms")
+    print(f"time-to-ready: median {statistics.median(ready_ms):7.1f} ms  min {min(ready_ms):7.1f} ms")
+    print(f"lazy modules loaded at startup: {', '.join(leaked) or 'none'}")
+
+    failed = bool(leaked)
+    if args.max_import_ms is not None and statistics.median(import_ms) > args.max_import_ms:
+        print(f"FAIL: import median exceeds {args.max_import_ms} ms")
+        failed = True
+    if args.max_ready_ms is not None and statistics.median(ready_ms) > args.max_ready_ms:
+        print(f"FAIL: time-to-ready median exceeds {args.max_ready_ms} ms")
+        failed = True
+    sys.exit(1 if failed else 0)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,201 @@
+"""Replay recorded OVM traffic through the poller, offline
+
+Record traffic by setting "ovm_capture_file" in config.json. The bot then
+appends every OVM API response, every poller cycle start and the tracked
+lots to that file. This script feeds a recording back through the real poll
+cycle (veilingmeester.poll_tracked_lots) without network or Discord:
+
+  - tracked lots are seeded from the recording and re-seeded whenever they
+    changed during the capture
+  - each URL is answered with its latest recorded response from that cycle;
+    recorded failures (timeouts, connection errors) are raised again
+  - cycles run at recorded pace divided by --speed (0 = no waiting), and
+    recorded response latency is replayed the same way
+
+Per-cycle profiling:
+  --profile DIR       write cProfile stats per cycle to DIR/cycle-N.prof
+  --tracemalloc       print the top allocation growth per cycle
+
+Usage:
+    python replay_ovm.py capture.jsonl [--speed 60] [--profile out/] [--tracemalloc]
+"""
+import argparse
+import asyncio
+import bisect
+import builtins
+import cProfile
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+REPO_DIR = os.path.dirname(os.path.abspath(__file__))
+
+def rebuild_error(name: str, detail: str) -> Exception:
+    """Recreate a recorded exception, falling back to a generic aiohttp.ClientError"""
+    import aiohttp
+    exc_type = getattr(aiohttp, name, None) or getattr(asyncio, name, None) or getattr(builtins, name, None)
+    if isinstance(exc_type, type) and issubclass(exc_type, Exception):
+        try:
+            return exc_type(detail)
+        except TypeError:
+            pass  # constructors like ClientConnectorError need more than a message
+    return aiohttp.ClientError(f"{name}: {detail}")
+
+def load_recording(path: str):
+    """Split a capture file into responses per URL, cycle starts and tracked snapshots"""
+    responses = {}  # url -> ([t, ...], [record, ...])
+    cycles = []
+    snapshots = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue  # a torn last line from an interrupted capture
+            if "url" in record:
+                times, records = responses.setdefault(record["url"], ([], []))
+                times.append(record["t"])
+                records.append(record)
+            elif "cycle" in record:
+                cycles.append(record["t"])
+            elif "tracked" in record:
+                snapshots.append(record)
+    return responses, cycles, snapshots
+
+class ReplayTransport:
+    """Answers OVM URLs from a recording, as of the current replay window"""
+    def __init__(self, responses, speed: float):
+        self.responses = responses
+        self.speed = speed
+        self.until = 0.0  # end of the current cycle window
+        self.served = 0
+        self.missed = 0
+        self.failed = 0
+
+    async def __call__(self, url: str):
+        times, records = self.responses.get(url, ([], []))
+        idx = bisect.bisect_left(times, self.until) - 1
+        if idx < 0:
+            self.missed += 1
+            return 404, None
+        record = records[idx]
+        if self.speed > 0 and record.get("ms"):
+            await asyncio.sleep(record["ms"] / 1000 / self.speed)
+        if "error" in record:
+            self.failed += 1
+            raise rebuild_error(record["error"], record.get("detail", ""))
+        self.served += 1
+        return record["status"], record.get("body")
+
+def seed_tracked(vm, snapshot):
+    with vm.get_db_transaction() as c:
+        c.execute("DELETE FROM tracked_auctions")
+        c.executemany("""
+        INSERT OR REPLACE INTO tracked_auctions
+        (auction_id, lot_id, user_id, last_bid)
+        VALUES (?, ?, ?, ?)
+        """, [tuple(row) for row in snapshot["tracked"]])
+
+async def replay(vm, args):
+    responses, cycles, snapshots = load_recording(args.recording)
+    if not cycles:
+        print("No poller cycles in recording")
+        return
+
+    transport = ReplayTransport(responses, args.speed)
+    vm.ovm_transport = transport
+    if args.profile:
+        os.makedirs(args.profile, exist_ok=True)
+    if args.tracemalloc:
+        tracemalloc.start()
+        previous = tracemalloc.take_snapshot().filter_traces([
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, cProfile.__file__),
+        ])
+
+    snapshot_times = [s["t"] for s in snapshots]
+    seeded = -1
+    for n, cycle_start in enumerate(cycles, 1):
+        if args.cycles and n > args.cycles:
+            break
+
+        snap_idx = bisect.bisect_right(snapshot_times, cycle_start) - 1
+        if snap_idx > seeded:
+            seed_tracked(vm, snapshots[snap_idx])
+            seeded = snap_idx
+
+        if n > 1 and args.speed > 0:
+            await asyncio.sleep((cycle_start - cycles[n - 2]) / args.speed)
+        transport.until = cycles[n] if n < len(cycles) else float("inf")
+        served, missed, failed = transport.served, transport.missed, transport.failed
+
+        profiler = cProfile.Profile() if args.profile else None
+        start = time.perf_counter()
+        if profiler:
+            profiler.enable()
+        digests = await vm.poll_tracked_lots()
+        if profiler:
+            profiler.disable()
+            profiler.dump_stats(os.path.join(args.profile, f"cycle-{n}.prof"))
+        duration = time.perf_counter() - start
+
+        notifications = sum(len(lots) for lots in digests.values())
+        print(
+            f"cycle {n}: {duration * 1000:8.1f} ms  "
+            f"requests {transport.served - served:4d}  failed {transport.failed - failed:3d}  "
+            f"missing {transport.missed - missed:3d}  "
+            f"new bids {notifications:4d} for {len(digests)} user(s)"
+        )
+
+        if args.tracemalloc:
+            current = tracemalloc.take_snapshot().filter_traces([
+                tracemalloc.Filter(False, tracemalloc.__file__),
+                tracemalloc.Filter(False, cProfile.__file__),
+            ])
+            for stat in current.compare_to(previous, "lineno")[:args.tracemalloc_top]:
+                print(f"    {stat}")
+            previous = current
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("recording")
+    parser.add_argument("--speed", type=float, default=0, help="1 = real time, 60 = one minute per second, 0 = no waiting")
+    parser.add_argument("--cycles", type=int, default=0, help="stop after this many cycles")
+    parser.add_argument("--profile", metavar="DIR", help="write cProfile stats per cycle")
+    parser.add_argument("--tracemalloc", action="store_true", help="print allocation growth per cycle")
+    parser.add_argument("--tracemalloc-top", type=int, default=5)
+    args = parser.parse_args()
+    args.recording = os.path.abspath(args.recording)
+    if args.profile:
+        args.profile = os.path.abspath(args.profile)
+
+    # Run against a throwaway config and database so the live bot state is untouched
+    with tempfile.TemporaryDirectory() as workdir:
+        with open(os.path.join(workdir, "config.json"), "w") as f:
+            json.dump({
+                "discord_token": "replay",
+                "openai_api_key": "replay",
+                "log_channel_id": 1,
+                "allowed_channel_id": 1,
+                "updates_channel_id": 1,
+                "allowed_role_id": 1,
+                "log_info_rate_limit": 5,
+            }, f)
+        os.chdir(workdir)
+        sys.path.insert(0, REPO_DIR)
+        import veilingmeester as vm
+
+        async def run():
+            await vm.startup()
+            await replay(vm, args)
+
+        asyncio.run(run())
+
+if __name__ == "__main__":
+    main()
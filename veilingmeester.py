@@ -5,22 +5,22 @@ import asyncio
 import json
 import sqlite3
 import logging
-from logging.handlers import RotatingFileHandler
+from logging.handlers import RotatingFileHandler, QueueHandler, QueueListener
+import queue
+import random
+import atexit
+import copy
+import threading
 from contextlib import contextmanager
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Tuple
 from pydantic import BaseModel, validator
 from discord.ext import commands, tasks
 from discord.ui import Button, View
-from PIL import Image, ImageDraw, ImageOps
 from io import BytesIO
 from datetime import datetime, timezone
-import humanize
-from bs4 import BeautifulSoup
-import openai
 from functools import wraps
 import time
 import html
-from openai import AsyncOpenAI
 
 # --------------------------
 # Configuration Setup
@@ -38,9 +38,17 @@ class BotConfig(BaseModel):
     check_interval: int = 1 # minutes
     max_log_size: int = 5  # MB
     log_backup_count: int = 3
+    log_format: str = "text"  # "text" or "json"
+    log_info_sample_rate: float = 1.0  # fraction of INFO lines kept
+    log_info_rate_limit: int = 0  # max INFO lines per second per call site, 0 = unlimited
+    log_queue_size: int = 10000
+    ovm_capture_file: Optional[str] = None  # append OVM API traffic here, for replay_ovm.py
     max_concurrent_images: int = 5
     image_timeout: int = 10  # seconds
     http_timeout: int = 10  # seconds
+    listing_page_size: int = 100  # lots per listing page
+    listing_max_pages: int = 50
+    bulk_poll_threshold: int = 3  # tracked lots per auction before trying the listing endpoint
     
     @validator('allowed_channel_id', 'updates_channel_id', 'allowed_role_id', pre=True)
     def convert_ids(cls, v):
@@ -52,14 +60,107 @@ try:
 except Exception as e:
     print(f"CRITICAL: Failed to load config: {e}")
     raise
-client = AsyncOpenAI(api_key=config.openai_api_key)
+OVM_API_URL = "https://www.onlineveilingmeester.nl/rest/nl/v2"
+OVM_SITE_URL = "https://www.onlineveilingmeester.nl"
 
 # --------------------------
 # Logging Setup
 # --------------------------
 
+class JsonFormatter(logging.Formatter):
+    """Format log records as one JSON object per line"""
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        if record.exc_info:
+            entry["exc_info"] = self.formatException(record.exc_info)
+        if record.stack_info:
+            entry["stack_info"] = self.formatStack(record.stack_info)
+        return json.dumps(entry, ensure_ascii=False)
+
+class InfoThrottleFilter(logging.Filter):
+    """Sample and rate-limit INFO-and-below records; warnings and errors always pass"""
+    def __init__(self, sample_rate: float = 1.0, rate_limit: int = 0):
+        super().__init__()
+        self.sample_rate = sample_rate
+        self.rate_limit = rate_limit
+        self._windows: Dict[Tuple[str, int], List[float]] = {}  # call site -> [window start, count]
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno > logging.INFO:
+            return True
+        if self.sample_rate < 1.0 and random.random() >= self.sample_rate:
+            return False
+        if self.rate_limit > 0:
+            key = (record.pathname, record.lineno)
+            now = time.monotonic()
+            window = self._windows.get(key)
+            if window is None or now - window[0] >= 1.0:
+                self._windows[key] = [now, 1]
+            elif window[1] >= self.rate_limit:
+                return False
+            else:
+                window[1] += 1
+        return True
+
+class DroppingQueueHandler(QueueHandler):
+    """QueueHandler that sheds INFO-and-below records when the queue is full
+
+    Warnings and errors are never dropped; they wait for the listener thread to
+    make room. Dropped records are counted and reported periodically.
+    """
+    report_interval = 10.0  # seconds
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+        self._last_report = time.monotonic()
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        """Merge args into the message but keep the traceback for the listener's formatter
+
+        The stock prepare() folds the traceback into msg and clears exc_info,
+        which would hide it from JsonFormatter.
+        """
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord):
+        if record.levelno > logging.INFO:
+            self.queue.put(record)
+        else:
+            try:
+                self.queue.put_nowait(record)
+            except queue.Full:
+                self.dropped += 1
+                return
+        self._report_dropped()
+
+    def _report_dropped(self):
+        now = time.monotonic()
+        if not self.dropped or now - self._last_report < self.report_interval:
+            return
+        report = logging.makeLogRecord({
+            "name": __name__,
+            "levelno": logging.WARNING,
+            "levelname": "WARNING",
+            "msg": f"{self.dropped} log records dropped (log queue full)",
+        })
+        try:
+            self.queue.put_nowait(report)
+        except queue.Full:
+            return
+        self.dropped = 0
+        self._last_report = now
+
 def setup_logging():
-    """Configure logging to both file and console"""
+    """Configure logging to file and console through a background writer thread"""
     logger = logging.getLogger()
     logger.setLevel(logging.INFO)
     
@@ -70,18 +171,30 @@ def setup_logging():
         backupCount=config.log_backup_count,
         encoding='utf-8'
     )
-    file_formatter = logging.Formatter('[%(asctime)s] %(levelname)s - %(name)s: %(message)s')
-    file_handler.setFormatter(file_formatter)
     
     # Console handler
     console_handler = logging.StreamHandler()
-    console_formatter = logging.Formatter('%(levelname)s - %(name)s: %(message)s')
-    console_handler.setFormatter(console_formatter)
-    
-    logger.addHandler(file_handler)
-    logger.addHandler(console_handler)
 
-setup_logging()
+    if config.log_format == "json":
+        file_handler.setFormatter(JsonFormatter())
+        console_handler.setFormatter(JsonFormatter())
+    else:
+        file_handler.setFormatter(logging.Formatter('[%(asctime)s] %(levelname)s - %(name)s: %(message)s'))
+        console_handler.setFormatter(logging.Formatter('%(levelname)s - %(name)s: %(message)s'))
+
+    # The event loop only enqueues; file I/O and rotation happen on the listener thread
+    log_queue = queue.Queue(maxsize=config.log_queue_size)
+    queue_handler = DroppingQueueHandler(log_queue)
+    queue_handler.addFilter(InfoThrottleFilter(config.log_info_sample_rate, config.log_info_rate_limit))
+
+    listener = QueueListener(log_queue, file_handler, console_handler, respect_handler_level=True)
+    listener.start()
+    atexit.register(listener.stop)
+
+    logger.addHandler(queue_handler)
+    return listener
+
+log_listener: Optional[QueueListener] = None
 logger = logging.getLogger(__name__)
 
 # --------------------------
@@ -112,6 +225,14 @@ def get_db_cursor():
         finally:
             cursor.close()
 
+@contextmanager
+def get_db_transaction():
+    """Context manager for a cursor whose statements run in one transaction"""
+    with get_db_cursor() as c:
+        c.execute("BEGIN")
+        yield c
+        c.execute("COMMIT")
+
 def init_db():
     """Initialize database tables"""
     with get_db_cursor() as c:
@@ -124,17 +245,26 @@ def init_db():
             PRIMARY KEY (auction_id, lot_id, user_id)
         )
         """)
+        c.execute("CREATE INDEX IF NOT EXISTS idx_tracked_user ON tracked_auctions (user_id)")
         logger.info("Database initialized")
 
-init_db()
-
 # --------------------------
 # Discord Bot Setup
 # --------------------------
 
+class VeilingBot(commands.Bot):
+    async def setup_hook(self):
+        """Runs after login, before the gateway connects"""
+        # Route button clicks on embeds posted before a restart
+        self.add_dynamic_items(FollowButton, UnfollowButton, FollowAuctionButton)
+
+        # Resume polling from the persisted last_bid state straight away instead
+        # of waiting for on_ready, which can take a while on large guilds
+        check_auction_updates.start()
+
 intents = discord.Intents.default()
 intents.message_content = True
-bot = commands.Bot(command_prefix="!", intents=intents)
+bot = VeilingBot(command_prefix="!", intents=intents)
 
 # --------------------------
 # Utility Functions
@@ -176,6 +306,26 @@ def strip_html(html_text: str) -> str:
     html_text = re.sub(r'<[^>]+>', '', html_text)
     return re.sub(r'\n+', '\n', html_text).strip()
 
+def calculate_costs(bid: float, opgeld_percentage: float, handelingskosten: float, btw_percentage: float) -> Tuple[float, float, float, float]:
+    """Return (veilingkosten, handelingskosten, btw, totaal) for a bid"""
+    veilingkosten = round(bid * (opgeld_percentage / 100), 2)
+    handelingskosten = float(handelingskosten or 0)
+    kosten_totaal = veilingkosten + handelingskosten
+    btw = round((bid + kosten_totaal) * (btw_percentage / 100), 2)
+    totaal = round(bid + kosten_totaal + btw, 2)
+    return veilingkosten, handelingskosten, btw, totaal
+
+def format_closing(sluitings_datum_iso: Optional[str]) -> str:
+    """Human-friendly time until closing"""
+    try:
+        import humanize  # deferred: only needed once an embed is built
+
+        sluiting = datetime.fromisoformat(sluitings_datum_iso.replace("Z", "+00:00"))
+        delta = sluiting - datetime.now(timezone.utc)
+        return humanize.naturaldelta(delta) if delta.total_seconds() > 0 else "Gesloten"
+    except Exception:
+        return "Onbekend"
+
 async def send_to_log_channel(message: str, level: str = "info"):
     """Send log message to Discord log channel"""
     try:
@@ -204,6 +354,8 @@ async def compose_image_grid(urls: List[str]) -> Optional[BytesIO]:
     start_time = time.perf_counter()
 
     """Create a grid image from multiple URLs"""
+    from PIL import Image, ImageOps  # deferred: Pillow is slow to import
+
     CANVAS_SIZE = 1200
     MAX_IMAGES = 9
     
@@ -260,6 +412,16 @@ async def compose_image_grid(urls: List[str]) -> Optional[BytesIO]:
 # AI Summary Generation
 # --------------------------
 
+_openai_client = None
+
+def get_openai_client():
+    """Create the OpenAI client on first use; the openai package is slow to import"""
+    global _openai_client
+    if _openai_client is None:
+        from openai import AsyncOpenAI
+        _openai_client = AsyncOpenAI(api_key=config.openai_api_key)
+    return _openai_client
+
 @track_performance
 async def generate_summary(**kwargs) -> str:
     """Generate AI summary of auction item"""
@@ -282,7 +444,7 @@ async def generate_summary(**kwargs) -> str:
     )
 
     try:
-        client = openai.AsyncOpenAI(api_key=config.openai_api_key)
+        client = get_openai_client()
 
         response = await client.chat.completions.create(
             model="gpt-3.5-turbo",
@@ -301,33 +463,64 @@ async def generate_summary(**kwargs) -> str:
 # Discord Views
 # --------------------------
 
-class FollowView(View):
-    """View for tracking/untracking auctions"""
+class FollowButton(discord.ui.DynamicItem[Button], template=r"ovm:volg:(?P<auction_id>\d+):(?P<lot_id>\d+):(?P<bid_cents>\d+)"):
+    """Persistent button to track a lot; auction, lot and bid live in the custom_id"""
     def __init__(self, auction_id: str, lot_id: str, bid_amount: float):
-        super().__init__(timeout=None)
         self.auction_id = auction_id
         self.lot_id = lot_id
         self.bid_amount = bid_amount
+        super().__init__(Button(
+            label="🔨 Volg",
+            style=discord.ButtonStyle.success,
+            custom_id=f"ovm:volg:{auction_id}:{lot_id}:{round(bid_amount * 100)}"
+        ))
+
+    @classmethod
+    async def from_custom_id(cls, interaction: discord.Interaction, item: Button, match: re.Match):
+        return cls(match["auction_id"], match["lot_id"], int(match["bid_cents"]) / 100)
 
-    @discord.ui.button(label="🔨 Volg", style=discord.ButtonStyle.success)
-    async def follow_button(self, interaction: discord.Interaction, button: discord.ui.Button):
+    async def callback(self, interaction: discord.Interaction):
         """Track this auction lot"""
         try:
+            # The custom_id bid dates from when the embed was posted; prefer a newer cached one
+            cached = lot_cache.get((self.auction_id, self.lot_id))
+            bid = max(self.bid_amount, cached.bid if cached else 0)
+
+            # Keep an existing row: its last_bid may be newer than this (possibly old) embed
             with get_db_cursor() as c:
                 c.execute("""
-                INSERT OR REPLACE INTO tracked_auctions 
+                INSERT INTO tracked_auctions 
                 (auction_id, lot_id, last_bid, user_id) 
                 VALUES (?, ?, ?, ?)
-                """, (self.auction_id, self.lot_id, self.bid_amount, str(interaction.user.id)))
-            
+                ON CONFLICT(auction_id, lot_id, user_id) DO NOTHING
+                """, (self.auction_id, self.lot_id, bid, str(interaction.user.id)))
+                inserted = c.rowcount
+
+            if not inserted:
+                await interaction.response.send_message("✅ Je volgt dit kavel al.", ephemeral=True)
+                return
             logger.info(f"User {interaction.user.id} started tracking {self.auction_id}/{self.lot_id}")
             await interaction.response.send_message("✅ Je volgt dit kavel nu.", ephemeral=True)
         except Exception as e:
             logger.error(f"Follow error: {e}", exc_info=True)
             await interaction.response.send_message("❌ Fout bij volgen van kavel.", ephemeral=True)
 
-    @discord.ui.button(label="❌ Stop Volgen", style=discord.ButtonStyle.danger)
-    async def unfollow_button(self, interaction: discord.Interaction, button: discord.ui.Button):
+class UnfollowButton(discord.ui.DynamicItem[Button], template=r"ovm:stop:(?P<auction_id>\d+):(?P<lot_id>\d+)"):
+    """Persistent button to stop tracking a lot"""
+    def __init__(self, auction_id: str, lot_id: str):
+        self.auction_id = auction_id
+        self.lot_id = lot_id
+        super().__init__(Button(
+            label="❌ Stop Volgen",
+            style=discord.ButtonStyle.danger,
+            custom_id=f"ovm:stop:{auction_id}:{lot_id}"
+        ))
+
+    @classmethod
+    async def from_custom_id(cls, interaction: discord.Interaction, item: Button, match: re.Match):
+        return cls(match["auction_id"], match["lot_id"])
+
+    async def callback(self, interaction: discord.Interaction):
         """Stop tracking this auction lot"""
         try:
             with get_db_cursor() as c:
@@ -342,6 +535,38 @@ class FollowView(View):
             logger.error(f"Unfollow error: {e}", exc_info=True)
             await interaction.response.send_message("❌ Fout bij stoppen met volgen.", ephemeral=True)
 
+class FollowAuctionButton(discord.ui.DynamicItem[Button], template=r"ovm:veiling:(?P<auction_id>\d+)"):
+    """Persistent button to track every lot of an auction"""
+    def __init__(self, auction_id: str):
+        self.auction_id = auction_id
+        super().__init__(Button(
+            label="📚 Volg hele veiling",
+            style=discord.ButtonStyle.primary,
+            custom_id=f"ovm:veiling:{auction_id}"
+        ))
+
+    @classmethod
+    async def from_custom_id(cls, interaction: discord.Interaction, item: Button, match: re.Match):
+        return cls(match["auction_id"])
+
+    async def callback(self, interaction: discord.Interaction):
+        """Track every lot of this auction"""
+        await interaction.response.defer(ephemeral=True, thinking=True)
+        try:
+            result = await follow_auction(self.auction_id, str(interaction.user.id))
+            await interaction.followup.send(follow_auction_reply(self.auction_id, result), ephemeral=True)
+        except Exception as e:
+            logger.error(f"Follow auction error: {e}", exc_info=True)
+            await interaction.followup.send("❌ Fout bij volgen van veiling.", ephemeral=True)
+
+class FollowView(View):
+    """View for tracking/untracking auctions; buttons keep working after a restart"""
+    def __init__(self, auction_id: str, lot_id: str, bid_amount: float):
+        super().__init__(timeout=None)
+        self.add_item(FollowButton(auction_id, lot_id, bid_amount))
+        self.add_item(UnfollowButton(auction_id, lot_id))
+        self.add_item(FollowAuctionButton(auction_id))
+
 # --------------------------
 # Auction Handlers
 # --------------------------
@@ -361,21 +586,326 @@ class AuctionData(BaseModel):
     categorie: Dict[str, Any] = {}
     isShippable: bool = False
 
-@track_performance
+class LotSummary(BaseModel):
+    """Bid state of a single lot, from the auction listing or a lot detail fetch"""
+    auction_id: str
+    lot_id: str
+    naam: str = "Kavel"
+    hoogsteBod: Optional[float] = 0.0
+    openingsBod: Optional[float] = 0.0
+    opgeldPercentage: float = 17.0
+    btwPercentage: float = 21.0
+    handelingskosten: float = 0.0
+    sluitingsDatumISO: Optional[str] = None
+    imageList: List[str] = []
+    aantalBiedingen: Optional[int] = 0
+
+    @classmethod
+    def from_listing_entry(cls, auction_id: str, entry: Dict[str, Any]) -> Optional["LotSummary"]:
+        """Build from a listing entry; returns None if it has no usable lot id"""
+        kavel = entry.get("kavelData") or {}
+        candidates = (entry.get("kavelnummer"), entry.get("kavelNummer"), entry.get("id"), kavel.get("id"))
+        lot_id = next((c for c in candidates if c is not None), None)
+        if lot_id is None:
+            return None
+        fields = {k: v for k, v in entry.items() if k in cls.__fields__ and v is not None}
+        fields.update(auction_id=str(auction_id), lot_id=str(lot_id))
+        fields["naam"] = entry.get("naam") or kavel.get("naam") or "Kavel"
+        return cls(**fields)
+
+    @classmethod
+    def from_auction_data(cls, auction_id: str, lot_id: str, data: "AuctionData") -> "LotSummary":
+        """Build from a full lot detail response"""
+        return cls(
+            auction_id=str(auction_id),
+            lot_id=str(lot_id),
+            naam=data.kavelData.get("naam", "Kavel"),
+            hoogsteBod=data.hoogsteBod,
+            openingsBod=data.openingsBod,
+            opgeldPercentage=data.opgeldPercentage,
+            btwPercentage=data.btwPercentage,
+            handelingskosten=data.handelingskosten,
+            sluitingsDatumISO=data.sluitingsDatumISO,
+            imageList=data.imageList,
+            aantalBiedingen=data.aantalBiedingen,
+        )
+
+    @property
+    def bid(self) -> float:
+        return float(self.hoogsteBod or self.openingsBod or 0)
+
+    @property
+    def url(self) -> str:
+        return f"{OVM_SITE_URL}/nl/veilingen/{self.auction_id}/kavels/{self.lot_id}"
+
+    @property
+    def closes_at(self) -> Optional[datetime]:
+        try:
+            sluiting = datetime.fromisoformat(self.sluitingsDatumISO.replace("Z", "+00:00"))
+        except Exception:
+            return None
+        return sluiting if sluiting.tzinfo else sluiting.replace(tzinfo=timezone.utc)
+
+# Latest known state per (auction_id, lot_id), refreshed by the poller
+lot_cache: Dict[Tuple[str, str], LotSummary] = {}
+
+class OvmCapture:
+    """Append-only JSON Lines recording of OVM API traffic
+
+    Records are one compact JSON object per line:
+      {"t": ..., "url": ..., "status": ..., "ms": ..., "body": ...}  a response
+      {"t": ..., "url": ..., "error": ..., "detail": ..., "ms": ...}  a request that raised
+      {"t": ..., "cycle": n}                                       a poller cycle start
+      {"t": ..., "tracked": [[auction_id, lot_id, user_id, last_bid], ...]}
+                                                                   tracked rows, when changed
+
+    The event loop only enqueues; serializing and file I/O happen on a writer thread.
+    """
+    def __init__(self, path: str):
+        self.path = path
+        self._queue: queue.SimpleQueue = queue.SimpleQueue()
+        self._cycle = 0
+        self._tracked_hash = None
+        self._thread = threading.Thread(target=self._writer, name="ovm-capture", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def _writer(self):
+        with open(self.path, "a", encoding="utf-8") as f:
+            while True:
+                record = self._queue.get()
+                if record is None:
+                    break
+                f.write(json.dumps(record, separators=(",", ":"), ensure_ascii=False) + "\n")
+                # Flush once a burst has been written, not per record
+                if self._queue.empty():
+                    f.flush()
+
+    def close(self):
+        if self._thread.is_alive():
+            self._queue.put(None)
+            self._thread.join()
+
+    def response(self, url: str, status: int, body: Any, duration: float):
+        self._queue.put({"t": time.time(), "url": url, "status": status, "ms": round(duration * 1000, 1), "body": body})
+
+    def failure(self, url: str, error: Exception, duration: float):
+        self._queue.put({
+            "t": time.time(), "url": url, "error": type(error).__name__,
+            "detail": str(error), "ms": round(duration * 1000, 1)
+        })
+
+    def cycle(self, rows: List[sqlite3.Row]):
+        tracked = [[r["auction_id"], r["lot_id"], r["user_id"], r["last_bid"]] for r in rows]
+        tracked_hash = hash(tuple(map(tuple, tracked)))
+        if tracked_hash != self._tracked_hash:
+            self._tracked_hash = tracked_hash
+            self._queue.put({"t": time.time(), "tracked": tracked})
+        self._cycle += 1
+        self._queue.put({"t": time.time(), "cycle": self._cycle})
+
+ovm_capture: Optional[OvmCapture] = None
+
+# Replaces live HTTP when set: async (url) -> (status, body). Used by replay_ovm.py
+ovm_transport = None
+
+async def ovm_get_json(session: aiohttp.ClientSession, url: str) -> Tuple[int, Any]:
+    """GET an OVM REST url; the single HTTP entry point so traffic can be captured or replayed"""
+    if ovm_transport is not None:
+        return await ovm_transport(url)
+
+    start = time.perf_counter()
+    try:
+        async with session.get(url) as resp:
+            status = resp.status
+            body = await resp.json() if status == 200 else None
+    except Exception as e:
+        if ovm_capture:
+            ovm_capture.failure(url, e, time.perf_counter() - start)
+        raise
+    if ovm_capture:
+        ovm_capture.response(url, status, body, time.perf_counter() - start)
+    return status, body
+
+def _listing_entries(payload: Any) -> List[Dict[str, Any]]:
+    """Extract lot entries from a listing response (bare list or wrapped in an object)"""
+    if isinstance(payload, list):
+        return payload
+    if isinstance(payload, dict):
+        for key in ("kavels", "results", "items", "content"):
+            if isinstance(payload.get(key), list):
+                return payload[key]
+    return []
+
+# Listing requests the last listing fetch per auction needed
+# LISTING_UNAVAILABLE marks auctions whose listing failed or matched none of the tracked lots
+LISTING_UNAVAILABLE = 0
+listing_pages: Dict[str, int] = {}
+
+async def fetch_auction_lots(session: aiohttp.ClientSession, auction_id: str, wanted: Optional[set] = None) -> Tuple[List[LotSummary], int, bool]:
+    """Fetch the lots of an auction through the paginated listing endpoint
+
+    Returns (lots, listing requests made, complete). `complete` is False when a
+    page failed or listing_max_pages ran out before the listing ended.
+    With `wanted`, paging stops as soon as all of those lot ids have been seen.
+    """
+    lots: Dict[str, LotSummary] = {}
+    complete = False
+    for page in range(1, config.listing_max_pages + 1):
+        url = f"{OVM_API_URL}/veilingen/{auction_id}/kavels?pagina={page}&aantal={config.listing_page_size}"
+        status, body = await ovm_get_json(session, url)
+        if status != 200:
+            logger.warning(f"Listing API returned {status} for {url}")
+            break
+        entries = _listing_entries(body)
+
+        new_ids = 0
+        for entry in entries:
+            try:
+                lot = LotSummary.from_listing_entry(auction_id, entry)
+            except Exception as e:
+                logger.warning(f"Invalid listing entry in auction {auction_id}: {e}")
+                continue
+            if lot and lot.lot_id not in lots:
+                new_ids += 1
+            if lot:
+                lots[lot.lot_id] = lot
+
+        if len(entries) < config.listing_page_size:
+            complete = True
+            break
+        if wanted and wanted.issubset(lots):
+            complete = True
+            break
+        # A page without new lots means the endpoint ignores paging and already returned everything
+        if not new_ids:
+            logger.warning(f"Listing page {page} for auction {auction_id} repeated earlier lots; stopping")
+            complete = True
+            break
+    else:
+        logger.warning(f"Listing for auction {auction_id} exceeds {config.listing_max_pages} pages; stopping")
+
+    logger.info(f"Fetched {len(lots)} lots for auction {auction_id} in {page} listing request(s)")
+    return list(lots.values()), page, complete
+
+async def fetch_lot(session: aiohttp.ClientSession, auction_id: str, lot_id: str) -> Optional[LotSummary]:
+    """Fetch a single lot through the lot detail endpoint"""
+    url = f"{OVM_API_URL}/veilingen/{auction_id}/kavels/{lot_id}"
+    status, body = await ovm_get_json(session, url)
+    if status != 200:
+        logger.warning(f"API error for {url}: {status}")
+        return None
+    try:
+        data = AuctionData(**body)
+    except Exception as e:
+        logger.error(f"Invalid API response for {url}: {e}")
+        return None
+    return LotSummary.from_auction_data(auction_id, lot_id, data)
+
+async def fetch_lot_states(session: aiohttp.ClientSession, auction_id: str, lot_ids: List[str]) -> Dict[str, LotSummary]:
+    """Fetch current state for tracked lots, batching through the listing when worthwhile"""
+    states: Dict[str, LotSummary] = {}
+    # The listing only pays off when it needs fewer requests than one per tracked lot;
+    # until the page count is known, try it once the threshold is reached
+    pages = listing_pages.get(auction_id)
+    if pages is None:
+        use_listing = len(lot_ids) >= config.bulk_poll_threshold
+    else:
+        use_listing = pages != LISTING_UNAVAILABLE and len(lot_ids) > pages
+    if use_listing:
+        try:
+            wanted = set(lot_ids)
+            listing, pages, _ = await fetch_auction_lots(session, auction_id, wanted)
+            states = {lot.lot_id: lot for lot in listing if lot.lot_id in wanted}
+        except Exception as e:
+            logger.warning(f"Listing fetch failed for auction {auction_id}: {e}")
+        # Only trust the listing for this auction if it actually resolved tracked lots
+        if states:
+            listing_pages[auction_id] = pages
+        else:
+            logger.warning(f"Listing unusable for auction {auction_id}; using per-lot requests from now on")
+            listing_pages[auction_id] = LISTING_UNAVAILABLE
+
+    for lot_id in lot_ids:
+        if lot_id in states:
+            continue
+        try:
+            lot = await fetch_lot(session, auction_id, lot_id)
+        except Exception as e:
+            logger.error(f"Error checking auction {auction_id}/{lot_id}: {e}", exc_info=True)
+            continue
+        if lot:
+            states[lot_id] = lot
+    return states
+
+async def follow_auction(auction_id: str, user_id: str) -> Optional[Tuple[int, bool]]:
+    """Track every lot of an auction for a user
+
+    Returns (number of distinct lots followed, whether the listing was complete),
+    or None if no lots could be fetched.
+    """
+    async with aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=config.http_timeout)) as session:
+        lots, _, complete = await fetch_auction_lots(session, auction_id)
+    if not lots:
+        return None
+
+    for lot in lots:
+        lot_cache[(lot.auction_id, lot.lot_id)] = lot
+
+    with get_db_transaction() as c:
+        c.executemany("""
+        INSERT OR IGNORE INTO tracked_auctions
+        (auction_id, lot_id, last_bid, user_id)
+        VALUES (?, ?, ?, ?)
+        """, [(lot.auction_id, lot.lot_id, lot.bid, user_id) for lot in lots])
+        inserted = c.rowcount
+
+    logger.info(
+        f"User {user_id} started tracking {len(lots)} lots of auction {auction_id} "
+        f"({inserted} new{'' if complete else ', listing incomplete'})"
+    )
+    return len(lots), complete
+
+def follow_auction_reply(auction_id: str, result: Optional[Tuple[int, bool]]) -> str:
+    """User-facing message for a follow_auction result"""
+    if result is None:
+        return "❌ Kan kavels van deze veiling niet ophalen."
+    count, complete = result
+    if not complete:
+        return (
+            f"⚠️ Je volgt nu {count} kavels van veiling {auction_id}, maar de kavellijst was onvolledig. "
+            f"Probeer het later opnieuw om de overige kavels toe te voegen."
+        )
+    return f"✅ Je volgt nu {count} kavels van veiling {auction_id}."
+
+def unfollow_auction(auction_id: str, user_id: str) -> int:
+    """Stop tracking every lot of an auction for a user; returns the number of lots removed"""
+    with get_db_cursor() as c:
+        c.execute("""
+        DELETE FROM tracked_auctions
+        WHERE auction_id=? AND user_id=?
+        """, (auction_id, user_id))
+        removed = c.rowcount
+
+    logger.info(f"User {user_id} stopped tracking {removed} lots of auction {auction_id}")
+    return removed
 
+@track_performance
 async def handle_ovm(message: discord.Message, auction_id: str, lot_id: str, start_time: datetime):
     """Handle OVM auction links"""
-    url = f"https://www.onlineveilingmeester.nl/rest/nl/v2/veilingen/{auction_id}/kavels/{lot_id}"
+    url = f"{OVM_API_URL}/veilingen/{auction_id}/kavels/{lot_id}"
     logger.info(f"Fetching OVM data from {url}")
 
     try:
         async with aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=config.http_timeout)) as session:
-            async with session.get(url) as resp:
-                if resp.status != 200:
-                    logger.warning(f"OVM API returned {resp.status} for {url}")
-                    await message.reply("❌ Kan veilinggegevens niet ophalen (API fout).")
-                    return
-                data = AuctionData(**await resp.json())
+            status, body = await ovm_get_json(session, url)
+            if status != 200:
+                logger.warning(f"OVM API returned {status} for {url}")
+                await message.reply("❌ Kan veilinggegevens niet ophalen (API fout).")
+                return
+            data = AuctionData(**body)
+
+        lot_cache[(auction_id, lot_id)] = LotSummary.from_auction_data(auction_id, lot_id, data)
 
         # Prepare item data
         item = data.kavelData
@@ -386,19 +916,15 @@ async def handle_ovm(message: discord.Message, auction_id: str, lot_id: str, sta
         # Calculate timings
         try:
             sluiting = datetime.fromisoformat(data.sluitingsDatumISO.replace("Z", "+00:00"))
-            now = datetime.now(timezone.utc)
-            delta = sluiting - now
-            sluit_over = "Gesloten" if delta.total_seconds() <= 0 else humanize.naturaldelta(delta)
+            sluit_over = format_closing(data.sluitingsDatumISO)
         except Exception as e:
             logger.warning(f"Error parsing closing date: {e}")
             sluit_over = "Onbekend"
 
         bod = float(data.hoogsteBod or data.openingsBod or 0)
-        veilingkosten = round(bod * (data.opgeldPercentage / 100), 2)
-        handelingskosten = float(data.handelingskosten or 0)
-        kosten_totaal = veilingkosten + handelingskosten
-        btw = round((bod + kosten_totaal) * (data.btwPercentage / 100), 2)
-        totaal = round(bod + kosten_totaal + btw, 2)
+        veilingkosten, handelingskosten, btw, totaal = calculate_costs(
+            bod, data.opgeldPercentage, data.handelingskosten, data.btwPercentage
+        )
 
         topbieders_str = "\n".join([
             f"{b.get('bieder', '?')}: € {b.get('bedrag', '?')},-" for b in data.biedingen[:3]
@@ -517,108 +1043,170 @@ async def handle_ovm(message: discord.Message, auction_id: str, lot_id: str, sta
 # Background Tasks
 # --------------------------
 
+def build_bid_embed(lot: LotSummary) -> discord.Embed:
+    """Detailed notification embed for a single new bid"""
+    veilingkosten, handelingskosten, btw, totaal = calculate_costs(
+        lot.bid, lot.opgeldPercentage, lot.handelingskosten, lot.btwPercentage
+    )
+    image = lot.imageList[0] if lot.imageList else None
+
+    embed = discord.Embed(
+        title="Nieuw bod geplaatst!",
+        url=lot.url,
+        description=f"**{lot.naam}**\n\n💰 Nieuw bod: € {lot.bid:.2f}\n💸 Totaal incl. kosten: € {totaal:.2f}",
+        color=discord.Color.green()
+    )
+
+    if image and isinstance(image, str) and image.strip():
+        embed.set_image(url=f"{OVM_SITE_URL}/images/800x600/{image.strip()}")
+
+    embed.add_field(name="💶 Bod", value=f"€ {lot.bid:.2f}", inline=True)
+    embed.add_field(name="📦 Veilingkosten", value=f"€ {veilingkosten:.2f}", inline=True)
+    embed.add_field(name="🧾 Handelingskosten", value=f"€ {handelingskosten:.2f}", inline=True)
+    embed.add_field(name="🧾 BTW", value=f"€ {btw:.2f}", inline=True)
+    embed.add_field(name="💳 Totaal", value=f"€ {totaal:.2f}", inline=True)
+    embed.add_field(name="📈 Aantal biedingen", value=str(lot.aantalBiedingen), inline=True)
+    embed.add_field(name="⏳ Sluit over", value=format_closing(lot.sluitingsDatumISO), inline=True)
+    return embed
+
+def format_lot_line(lot: LotSummary) -> str:
+    """One-line summary of a lot for digests and overviews"""
+    totaal = calculate_costs(lot.bid, lot.opgeldPercentage, lot.handelingskosten, lot.btwPercentage)[3]
+    return (
+        f"**[{lot.naam[:80]}]({lot.url})**\n"
+        f"💰 € {lot.bid:.2f} · 💳 € {totaal:.2f} · ⏳ {format_closing(lot.sluitingsDatumISO)}"
+    )
+
+EMBED_DESCRIPTION_LIMIT = 4000
+MESSAGE_EMBED_BUDGET = 5600  # Discord caps the embeds of one message at 6000 characters
+MESSAGE_MAX_EMBEDS = 10
+
+def paginate_embeds(title: str, lines: List[str], color: discord.Color) -> List[List[discord.Embed]]:
+    """Spread lines over as many embeds and messages as needed within Discord's limits"""
+    messages: List[List[str]] = [[]]
+    budget = MESSAGE_EMBED_BUDGET
+    current = ""
+    for line in lines:
+        line += "\n"
+        if current and len(current) + len(line) > min(EMBED_DESCRIPTION_LIMIT, budget):
+            messages[-1].append(current)
+            budget -= len(current) + len(title) + 20
+            current = ""
+            if len(messages[-1]) == MESSAGE_MAX_EMBEDS or budget < len(line):
+                messages.append([])
+                budget = MESSAGE_EMBED_BUDGET
+        current += line
+    if current:
+        messages[-1].append(current)
+
+    total = sum(len(pages) for pages in messages)
+    result, page = [], 0
+    for pages in messages:
+        embeds = []
+        for description in pages:
+            page += 1
+            embeds.append(discord.Embed(
+                title=title if total == 1 else f"{title} ({page}/{total})",
+                description=description,
+                color=color
+            ))
+        result.append(embeds)
+    return result
+
+def build_digest_embeds(lots: List[LotSummary]) -> List[List[discord.Embed]]:
+    """Digest embeds listing every new bid of one update cycle, grouped per message"""
+    return paginate_embeds(
+        f"📬 {len(lots)} nieuwe biedingen",
+        [format_lot_line(lot) for lot in lots],
+        discord.Color.green()
+    )
+
+async def send_bid_digest(user_id: str, lots: List[LotSummary]):
+    """Send one notification per user per update cycle"""
+    messages = [[build_bid_embed(lots[0])]] if len(lots) == 1 else build_digest_embeds(lots)
+    try:
+        channel = bot.get_channel(config.updates_channel_id)
+        if channel:
+            # Only the first message pings; the rest continue the same digest
+            for idx, embeds in enumerate(messages):
+                await channel.send(content=f"<@{user_id}>" if idx == 0 else None, embeds=embeds)
+            logger.info(f"Sent update digest to {user_id}: {len(lots)} lot(s) in {len(messages)} message(s)")
+        else:
+            logger.warning("Updates channel not found")
+    except Exception as e:
+        logger.error(f"Failed to send update: {e}", exc_info=True)
+
+async def poll_tracked_lots() -> Dict[str, List[LotSummary]]:
+    """One poll cycle: refresh tracked lots, store new bids, return new bids per user"""
+    with get_db_cursor() as c:
+        c.execute("SELECT auction_id, lot_id, user_id, last_bid FROM tracked_auctions")
+        rows = c.fetchall()
+
+    if ovm_capture:
+        ovm_capture.cycle(rows)
+
+    if not rows:
+        logger.info("No auctions being tracked")
+        return {}
+
+    # auction_id -> lot_id -> [(user_id, last_bid)]
+    tracked: Dict[str, Dict[str, List[Tuple[str, float]]]] = {}
+    for row in rows:
+        tracked.setdefault(row["auction_id"], {}).setdefault(row["lot_id"], []).append(
+            (row["user_id"], float(row["last_bid"] or 0))
+        )
+
+    digests: Dict[str, List[LotSummary]] = {}
+    bid_updates: List[Tuple[float, str, str]] = []
+
+    async with aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=config.http_timeout)) as session:
+        for auction_id, lots in tracked.items():
+            try:
+                states = await fetch_lot_states(session, auction_id, list(lots))
+            except Exception as e:
+                logger.error(f"Error checking auction {auction_id}: {e}", exc_info=True)
+                continue
+
+            for lot_id, followers in lots.items():
+                lot = states.get(lot_id)
+                if lot is None:
+                    continue
+                lot_cache[(auction_id, lot_id)] = lot
+                notified = False
+                for user_id, last_bid in followers:
+                    if lot.bid > last_bid:
+                        digests.setdefault(user_id, []).append(lot)
+                        notified = True
+                if notified:
+                    bid_updates.append((lot.bid, auction_id, lot_id))
+
+    # Drop cached lots nobody tracks anymore
+    for key in [k for k in lot_cache if k[1] not in tracked.get(k[0], {})]:
+        del lot_cache[key]
+
+    if bid_updates:
+        with get_db_transaction() as c:
+            # Never lower a follower's last_bid, e.g. one who followed after a higher bid
+            c.executemany("""
+            UPDATE tracked_auctions SET last_bid=? 
+            WHERE auction_id=? AND lot_id=? AND (last_bid IS NULL OR last_bid < ?)
+            """, [(bid, auction_id, lot_id, bid) for bid, auction_id, lot_id in bid_updates])
+
+    return digests
+
 @tasks.loop(minutes=config.check_interval)
 async def check_auction_updates():
     """Check for updates on tracked auctions"""
     logger.info("Starting auction update check")
     
     try:
-        with get_db_cursor() as c:
-            c.execute("SELECT DISTINCT auction_id, lot_id, last_bid FROM tracked_auctions")
-            tracked = c.fetchall()
-
-        if not tracked:
-            logger.info("No auctions being tracked")
-            return
+        digests = await poll_tracked_lots()
 
-        async with aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=config.http_timeout)) as session:
-            for row in tracked:
-                auction_id, lot_id, last_bid = row
-                url = f"https://www.onlineveilingmeester.nl/rest/nl/v2/veilingen/{auction_id}/kavels/{lot_id}"
-                
-                try:
-                    async with session.get(url) as resp:
-                        if resp.status != 200:
-                            logger.warning(f"API error for {url}: {resp.status}")
-                            continue
-                        
-                        try:
-                            data = AuctionData(**await resp.json())
-                        except Exception as e:
-                            logger.error(f"Invalid API response for {url}: {e}")
-                            continue
-
-                    new_bid = float(data.hoogsteBod or data.openingsBod or 0)
-                    if new_bid > last_bid:
-                        with get_db_cursor() as c:
-                            c.execute("""
-                            SELECT user_id FROM tracked_auctions 
-                            WHERE auction_id=? AND lot_id=?
-                            """, (auction_id, lot_id))
-                            users = c.fetchall()
-
-                        if not users:
-                            continue
-
-                        mentions = " ".join([f"<@{user['user_id']}>" for user in users])
-                        title = data.kavelData.get("naam", "Kavel")
-                        image = data.imageList[0] if data.imageList else None
-                        veilingkosten = round(new_bid * (data.opgeldPercentage / 100), 2)
-                        handelingskosten = float(data.handelingskosten or 0)
-                        kosten_totaal = veilingkosten + handelingskosten
-                        btw = round((new_bid + kosten_totaal) * (data.btwPercentage / 100), 2)
-                        totaal = round(new_bid + kosten_totaal + btw, 2)
-                        
-                        try:
-                            sluiting = datetime.fromisoformat(data.sluitingsDatumISO.replace("Z", "+00:00"))
-                            now = datetime.now(timezone.utc)
-                            delta = sluiting - now
-                            sluit_over = humanize.naturaldelta(delta) if delta.total_seconds() > 0 else "Gesloten"
-                        except Exception:
-                            sluit_over = "Onbekend"
-
-                        # Build notification embed
-                        embed = discord.Embed(
-                            title="Nieuw bod geplaatst!",
-                            url=f"https://www.onlineveilingmeester.nl/nl/veilingen/{auction_id}/kavels/{lot_id}",
-                            description=f"**{title}**\n\n💰 Nieuw bod: € {new_bid:.2f}\n💸 Totaal incl. kosten: € {totaal:.2f}",
-                            color=discord.Color.green()
-                        )
-                        
-                        if image and isinstance(image, str) and image.strip():
-                            embed.set_image(url=f"https://www.onlineveilingmeester.nl/images/800x600/{image.strip()}")
-
-
-                        embed.add_field(name="💶 Bod", value=f"€ {new_bid:.2f}", inline=True)
-                        embed.add_field(name="📦 Veilingkosten", value=f"€ {veilingkosten:.2f}", inline=True)
-                        embed.add_field(name="🧾 Handelingskosten", value=f"€ {handelingskosten:.2f}", inline=True)
-                        embed.add_field(name="🧾 BTW", value=f"€ {btw:.2f}", inline=True)
-                        embed.add_field(name="💳 Totaal", value=f"€ {totaal:.2f}", inline=True)
-                        embed.add_field(name="📈 Aantal biedingen", value=str(data.aantalBiedingen), inline=True)
-                        embed.add_field(name="⏳ Sluit over", value=sluit_over, inline=True)
-
-
-                        # Send notification
-                        try:
-                            channel = bot.get_channel(config.updates_channel_id)
-                            if channel:
-                                await channel.send(content=mentions, embed=embed)
-                                logger.info(f"Sent update for {auction_id}/{lot_id}: €{new_bid:.2f}")
-                            else:
-                                logger.warning("Updates channel not found")
-                        except Exception as e:
-                            logger.error(f"Failed to send update: {e}", exc_info=True)
-
-                        # Update database
-                        with get_db_cursor() as c:
-                            c.execute("""
-                            UPDATE tracked_auctions SET last_bid=? 
-                            WHERE auction_id=? AND lot_id=?
-                            """, (new_bid, auction_id, lot_id))
-
-                except Exception as e:
-                    logger.error(f"Error checking auction {auction_id}/{lot_id}: {e}", exc_info=True)
-                    continue
+        if digests:
+            # The first cycle runs before the gateway is ready; the channel cache is needed to send
+            await bot.wait_until_ready()
+        for user_id, lots in digests.items():
+            await send_bid_digest(user_id, lots)
 
     except Exception as e:
         logger.error(f"Error in auction update task: {e}", exc_info=True)
@@ -645,8 +1233,6 @@ async def on_ready():
         logger.info(f"Logged in as {bot.user} (ID: {bot.user.id})")
         logger.info(f"Guilds: {len(bot.guilds)}")
         
-        # Start background tasks
-        check_auction_updates.start()
         await send_to_log_channel("🤖 Bot is online and ready!")
         
     except Exception as e:
@@ -655,9 +1241,8 @@ async def on_ready():
 
 @bot.event
 async def on_disconnect():
-    """Clean up on disconnect"""
-    logger.info("Bot disconnecting - cleaning up")
-    check_auction_updates.stop()
+    """Log gateway disconnects; the poller keeps running and discord.py reconnects"""
+    logger.info("Bot disconnecting")
     await send_to_log_channel("🔌 Bot is disconnecting...")
 
 @bot.event
@@ -688,6 +1273,15 @@ async def on_message(message: discord.Message):
     elif message.content.startswith("!testbid"):
         await simulate_bid_notification(message)
         return
+    elif message.content.startswith("!volgveiling"):
+        await handle_follow_auction(message)
+        return
+    elif message.content.startswith("!stopveiling"):
+        await handle_unfollow_auction(message)
+        return
+    elif message.content.startswith("!mijnkavels"):
+        await handle_my_lots(message)
+        return
 
     # Only process auction links in allowed channel
     if message.channel.id != config.allowed_channel_id:
@@ -733,6 +1327,85 @@ async def handle_purge(message: discord.Message):
         logger.error(f"Purge error: {e}", exc_info=True)
         await message.reply("❌ Fout bij verwijderen van berichten.")
 
+def parse_auction_id(message: discord.Message) -> Optional[str]:
+    """Auction id from `!command <id>` or `!command <auction link>`"""
+    parts = message.content.split()
+    if len(parts) != 2:
+        return None
+    if parts[1].isdigit():
+        return parts[1]
+    if match := re.search(r'onlineveilingmeester\.nl/(?:nl/veilingen|en/auctions)/(\d+)', parts[1]):
+        return match.group(1)
+    return None
+
+async def handle_follow_auction(message: discord.Message):
+    """Track every lot of an auction"""
+    auction_id = parse_auction_id(message)
+    if not auction_id:
+        await message.reply("Gebruik: `!volgveiling <veiling-id of link>`")
+        return
+
+    try:
+        result = await follow_auction(auction_id, str(message.author.id))
+        await message.reply(follow_auction_reply(auction_id, result))
+    except Exception as e:
+        logger.error(f"Follow auction error: {e}", exc_info=True)
+        await message.reply("❌ Fout bij volgen van veiling.")
+
+async def handle_unfollow_auction(message: discord.Message):
+    """Stop tracking every lot of an auction"""
+    auction_id = parse_auction_id(message)
+    if not auction_id:
+        await message.reply("Gebruik: `!stopveiling <veiling-id of link>`")
+        return
+
+    try:
+        removed = unfollow_auction(auction_id, str(message.author.id))
+        await message.reply(f"✅ Je volgt {removed} kavels van veiling {auction_id} niet meer.")
+    except Exception as e:
+        logger.error(f"Unfollow auction error: {e}", exc_info=True)
+        await message.reply("❌ Fout bij stoppen met volgen van veiling.")
+
+async def handle_my_lots(message: discord.Message):
+    """List the author's tracked lots from cached lot state, without API calls"""
+    try:
+        with get_db_cursor() as c:
+            c.execute("""
+            SELECT auction_id, lot_id, last_bid FROM tracked_auctions
+            WHERE user_id=?
+            """, (str(message.author.id),))
+            rows = c.fetchall()
+
+        if not rows:
+            await message.reply("Je volgt nog geen kavels.")
+            return
+
+        lots = [
+            lot_cache.get((row["auction_id"], row["lot_id"])) or LotSummary(
+                auction_id=row["auction_id"],
+                lot_id=row["lot_id"],
+                naam=f"Kavel {row['lot_id']}",
+                hoogsteBod=row["last_bid"]
+            )
+            for row in rows
+        ]
+        # Soonest closing first; lots without a known closing time last
+        far_future = datetime.max.replace(tzinfo=timezone.utc)
+        lots.sort(key=lambda lot: lot.closes_at or far_future)
+
+        messages = paginate_embeds(
+            f"📋 Jouw kavels ({len(lots)})",
+            [format_lot_line(lot) for lot in lots],
+            discord.Color.orange()
+        )
+        messages[-1][-1].set_footer(text="Stand van de laatste controle")
+        await message.reply(embeds=messages[0])
+        for embeds in messages[1:]:
+            await message.channel.send(embeds=embeds)
+    except Exception as e:
+        logger.error(f"My lots error: {e}", exc_info=True)
+        await message.reply("❌ Fout bij ophalen van je kavels.")
+
 @track_performance
 async def simulate_bid_notification(message: discord.Message):
     """Simulate a bid notification for testing"""
@@ -763,10 +1436,23 @@ async def simulate_bid_notification(message: discord.Message):
 # Startup
 # --------------------------
 
+async def startup():
+    """Initialize logging and the database; runs before connecting to Discord"""
+    global log_listener, ovm_capture
+    log_listener = setup_logging()
+    await asyncio.to_thread(init_db)
+    if config.ovm_capture_file:
+        ovm_capture = OvmCapture(config.ovm_capture_file)
+        logger.info(f"Capturing OVM traffic to {config.ovm_capture_file}")
+
+async def main():
+    await startup()
+    async with bot:
+        await bot.start(config.discord_token)
+
 if __name__ == '__main__':
     try:
-        openai.api_key = config.openai_api_key
-        bot.run(config.discord_token)
+        asyncio.run(main())
     except Exception as e:
         logger.critical(f"Fatal error: {e}", exc_info=True)
         raise